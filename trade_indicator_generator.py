@@ -8,140 +8,256 @@ Enhanced to parse dates from Cloid field when no explicit date column exists.
 Fixed overlapping trade indicators by adding vertical offsets for different trade types.
 """
 
-import pandas as pd
 import argparse
+import os
+import re
 import sys
-from datetime import datetime, date
-from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
 
+# pandas and numpy are imported inside the functions that need them: their
+# combined import costs ~300 ms and ~40 MB, which dominates total runtime
+# for the stdlib --preview fast path and for argument errors, neither of
+# which touches either library
+
+# HH:MM[:SS] — same pattern the vectorized extraction in
+# generate_pinescript uses
+_TIME_RE = re.compile(r'^(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?$')
+
+# Leading letter followed by the YYMMDD date part of a Cloid
+_CLOID_RE = re.compile(r'^[A-Za-z](\d{6})')
+
+# Date formats accepted for an explicit date column, in order of likelihood
+_DATE_FORMATS = [
+    "%Y-%m-%d",      # 2024-05-14
+    "%m/%d/%Y",      # 05/14/2024
+    "%m/%d/%y",      # 05/14/24
+    "%Y%m%d",        # 20240514
+    "%m-%d-%Y",      # 05-14-2024
+    "%d/%m/%Y",      # 14/05/2024
+]
+
+# Single-regex equivalent of _DATE_FORMATS for the scalar parser: one match
+# classifies the shape, then the parts are converted arithmetically instead
+# of paying up to six strptime attempts (each a thrown exception on miss)
+_DATE_RE = re.compile(
+    r'^(?:(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2})'
+    r'|(?P<us_m>\d{1,2})/(?P<us_d>\d{1,2})/(?P<us_y>\d{2}|\d{4})'
+    r'|(?P<compact>\d{8})'
+    r'|(?P<dash_m>\d{1,2})-(?P<dash_d>\d{1,2})-(?P<dash_y>\d{4}))$'
+)
+
+@lru_cache(maxsize=8192)
 def parse_time(time_str):
     """Parse time string and return hour, minute, second"""
-    try:
-        time_obj = datetime.strptime(time_str, "%H:%M:%S")
-        return time_obj.hour, time_obj.minute, time_obj.second
-    except ValueError:
-        # Try alternative format
-        try:
-            time_obj = datetime.strptime(time_str, "%H:%M")
-            return time_obj.hour, time_obj.minute, 0
-        except ValueError:
-            print(f"Warning: Could not parse time '{time_str}', skipping...")
-            return None, None, None
+    match = _TIME_RE.match(time_str)
+    if match:
+        hour, minute, second = int(match[1]), int(match[2]), int(match[3] or 0)
+        # The regex only constrains digit count — reject out-of-range
+        # fields (e.g. 12:60:61) the way strptime did
+        if hour < 24 and minute < 60 and second < 60:
+            return hour, minute, second
+    print(f"Warning: Could not parse time '{time_str}', skipping...")
+    return None, None, None
 
+@lru_cache(maxsize=8192)
 def parse_date(date_str):
     """Parse date string and return year, month, day"""
+    import pandas as pd
+
     if pd.isna(date_str) or date_str == '' or date_str is None:
         return None, None, None
     
     try:
-        # Try common date formats
-        date_formats = [
-            "%Y-%m-%d",      # 2024-05-14
-            "%m/%d/%Y",      # 05/14/2024
-            "%m/%d/%y",      # 05/14/24
-            "%Y%m%d",        # 20240514
-            "%m-%d-%Y",      # 05-14-2024
-            "%d/%m/%Y",      # 14/05/2024
-        ]
-        
-        for fmt in date_formats:
-            try:
-                date_obj = datetime.strptime(str(date_str).strip(), fmt)
-                return date_obj.year, date_obj.month, date_obj.day
-            except ValueError:
-                continue
-        
+        match = _DATE_RE.match(str(date_str).strip())
+        if match:
+            if match['iso_y']:
+                year = int(match['iso_y'])
+                candidates = ((int(match['iso_m']), int(match['iso_d'])),)
+            elif match['us_y']:
+                year = int(match['us_y'])
+                if len(match['us_y']) == 2:
+                    # Same pivot strptime's %y uses for 2-digit years
+                    year += 2000 if year < 69 else 1900
+                # Month/day-first, with day/month-first as the fallback —
+                # mirrors trying %m/%d/%Y before %d/%m/%Y
+                candidates = ((int(match['us_m']), int(match['us_d'])),
+                              (int(match['us_d']), int(match['us_m'])))
+            elif match['compact']:
+                year, month_day = divmod(int(match['compact']), 10000)
+                candidates = (divmod(month_day, 100),)
+            else:
+                year = int(match['dash_y'])
+                candidates = ((int(match['dash_m']), int(match['dash_d'])),)
+
+            for month, day in candidates:
+                try:
+                    # Calendar validation (leap years, days-in-month)
+                    datetime(year, month, day)
+                except ValueError:
+                    continue
+                return year, month, day
+
         print(f"Warning: Could not parse date '{date_str}', skipping...")
         return None, None, None
     except Exception as e:
         print(f"Warning: Error parsing date '{date_str}': {e}")
         return None, None, None
 
+@lru_cache(maxsize=8192)
 def parse_date_from_cloid(cloid_str):
     """Parse date from Cloid field (format: [Letter][YY][MM][DD][sequence])
     Example: Q2505140017405 -> 2025-05-14
     """
+    import pandas as pd
+
     if pd.isna(cloid_str) or cloid_str == '' or cloid_str is None:
         return None, None, None
-    
+
     try:
-        cloid_str = str(cloid_str).strip()
-        
-        # Check if it matches the expected pattern: Letter + 6 digits + more digits
-        if len(cloid_str) >= 7 and cloid_str[0].isalpha():
-            # Extract the date part: positions 1-6 (YYMMDD)
-            date_part = cloid_str[1:7]
-            
-            if len(date_part) == 6 and date_part.isdigit():
-                year_part = date_part[0:2]  # YY
-                month_part = date_part[2:4]  # MM
-                day_part = date_part[4:6]    # DD
-                
-                # Convert 2-digit year to 4-digit year (assuming 20XX)
-                year = 2000 + int(year_part)
-                month = int(month_part)
-                day = int(day_part)
-                
-                # Validate the date
-                if 1 <= month <= 12 and 1 <= day <= 31:
-                    return year, month, day
-        
+        # Single regex match pulls out the 6-digit YYMMDD block, then two
+        # divmods split it — no substring slices or per-part int() calls
+        match = _CLOID_RE.match(str(cloid_str).strip())
+        if match:
+            yy, rest = divmod(int(match[1]), 10000)
+            month, day = divmod(rest, 100)
+
+            # Validate the date (2-digit year assumed to be 20XX)
+            if 1 <= month <= 12 and 1 <= day <= 31:
+                return 2000 + yy, month, day
+
         return None, None, None
     except Exception as e:
         print(f"Warning: Error parsing date from Cloid '{cloid_str}': {e}")
         return None, None, None
 
+def _cloid_date_lut(cloids):
+    """Vectorized parse_date_from_cloid over an array of distinct Cloids.
+
+    Views the strings as fixed-width ASCII bytes and does digit arithmetic
+    on the YYMMDD block entirely in numpy — for broker dumps with many
+    distinct Cloids this removes the per-value regex matching. Falls back
+    to the scalar parser if the values do not encode as ASCII."""
+    import numpy as np
+
+    try:
+        arr = np.char.strip(np.asarray(cloids, dtype='S16'))
+    except UnicodeEncodeError:
+        return {v: parse_date_from_cloid(v) for v in cloids}
+
+    width = arr.dtype.itemsize
+    if width < 7:
+        return {v: (None, None, None) for v in cloids}
+
+    codes = arr.view('S1').view(np.uint8).reshape(len(arr), width)
+    first = codes[:, 0]
+    digits = codes[:, 1:7].astype(np.int16) - 48
+    is_alpha = ((first >= 65) & (first <= 90)) | ((first >= 97) & (first <= 122))
+    is_digit = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    month = digits[:, 2] * 10 + digits[:, 3]
+    day = digits[:, 4] * 10 + digits[:, 5]
+    year = 2000 + digits[:, 0] * 10 + digits[:, 1]
+    valid = is_alpha & is_digit & (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+
+    return {v: ((y, mo, d) if ok else (None, None, None))
+            for v, ok, y, mo, d in zip(cloids, valid.tolist(), year.tolist(), month.tolist(), day.tolist())}
+
 def consolidate_trades(trades_df, symbol):
-    """Consolidate trades by timestamp and price for cleaner display"""
-    symbol_trades = trades_df[trades_df['Symbol'] == symbol].copy()
-    
+    """Consolidate trades by timestamp and price for cleaner display
+
+    Accepts either the full trades DataFrame or a DataFrameGroupBy keyed
+    by Symbol — callers emitting several symbols can group once and skip
+    the per-symbol column scan on every call."""
+    import pandas as pd
+
+    if isinstance(trades_df, pd.api.typing.DataFrameGroupBy):
+        if symbol in trades_df.groups:
+            symbol_trades = trades_df.get_group(symbol)
+        else:
+            symbol_trades = trades_df.obj.iloc[0:0]
+    else:
+        # Read-only projection of just the columns the aggregation needs —
+        # the groupby below produces its own frame, so the old defensive
+        # .copy() was a wasted full-frame memcpy
+        needed = ['Time', 'Side', 'Price', 'Qty'] + (['_y', '_mo', '_d'] if '_y' in trades_df.columns else [])
+        symbol_trades = trades_df.loc[trades_df['Symbol'] == symbol, needed]
+
+    # Categorical Side lets the groupby key-hash and the later per-side
+    # splits compare int8 codes instead of strings (main already loads the
+    # column this way; this covers callers passing a plain frame)
+    if not isinstance(symbol_trades['Side'].dtype, pd.CategoricalDtype):
+        symbol_trades = symbol_trades.assign(Side=symbol_trades['Side'].astype('category'))
+
     # Group by time, side, price, and date (if available)
     group_cols = ['Time', 'Side', 'Price']
-    if 'Date' in symbol_trades.columns:
-        group_cols.append('Date')
+    if '_y' in symbol_trades.columns:
+        group_cols.extend(['_y', '_mo', '_d'])
     
-    consolidated = []
-    grouped = symbol_trades.groupby(group_cols)
-    
-    for group_key, group in grouped:
-        total_qty = group['Qty'].sum()
-        trade_data = {
-            'Time': group_key[0],
-            'Side': group_key[1],
-            'Price': group_key[2],
-            'Qty': total_qty
-        }
-        if len(group_key) > 3:  # Date is included
-            trade_data['Date'] = group_key[3]
-        consolidated.append(trade_data)
-    
-    return pd.DataFrame(consolidated)
+    # Most CSVs have no duplicate (time, side, price) rows at all — one
+    # hashed duplicated() pass detects that and skips the groupby machinery
+    if not symbol_trades.duplicated(group_cols).any():
+        return symbol_trades[group_cols + ['Qty']].reset_index(drop=True)
+
+    # Single vectorized aggregation instead of building dicts group-by-group
+    # in Python — pandas sums Qty per group in its Cython groupby kernel
+    return symbol_trades.groupby(group_cols, as_index=False, sort=False, observed=True)['Qty'].sum()
+
+def iter_trade_rows(trades, include_date):
+    """Yield (time, price, qty, hour, minute, second, year, month, day)
+    tuples from plain Python scalars — avoids the per-row Series
+    construction of iterrows(). tolist() unboxes the numpy scalars once,
+    which keeps the f-string formatting in the emission loops on the fast
+    native-int/float path."""
+    if trades.empty:
+        return
+    cols = ('Time', 'Price', 'Qty', '_h', '_m', '_s')
+    if include_date and '_y' in trades.columns:
+        columns = [trades[col].tolist() for col in cols + ('_y', '_mo', '_d')]
+        yield from zip(*columns)
+    else:
+        columns = [trades[col].tolist() for col in cols]
+        for row in zip(*columns):
+            yield row + (None, None, None)
+
+def generate_pinescript(trades_df, symbol, output_file=None, merge_window=0):
+    """Generate Pine Script code from trades DataFrame
+
+    merge_window > 0 additionally collapses same-side trades falling in the
+    same merge_window-second time bucket into one entry (Qty summed, Price
+    averaged), shrinking the emitted script for dense fill data."""
+    import pandas as pd
+
+    # Lowercased symbol is embedded in several templates below — compute once
+    sym_l = symbol.lower()
+
+    # Filter to this symbol's rows before any date detection or parsing —
+    # otherwise every other symbol's dates get parsed and thrown away
+    if 'Symbol' in trades_df.columns:
+        trades_df = trades_df.loc[trades_df['Symbol'] == symbol]
 
-def generate_pinescript(trades_df, symbol, output_file=None):
-    """Generate Pine Script code from trades DataFrame"""
-    
     # Check if there's a date column (last column)
     has_date_column = False
     date_column_name = None
     date_source = None
     
-    # Get the last column that has actual data
-    last_col_idx = len(trades_df.columns) - 1
-    while last_col_idx >= 0:
-        col_name = trades_df.columns[last_col_idx]
-        if not trades_df[col_name].isna().all() and col_name not in ['Time', 'Symbol', 'Side', 'Price', 'Qty', 'Route', 'Broker', 'Account', 'Type', 'Cloid']:
+    # Get the last column that has actual data — one vectorized notna()
+    # reduction over the whole frame instead of a Python loop running a
+    # full-column isna().all() scan per candidate
+    known_columns = {'Time', 'Symbol', 'Side', 'Price', 'Qty', 'Route', 'Broker', 'Account', 'Type', 'Cloid'}
+    col_has_data = trades_df.notna().any()
+    for col_name in reversed(trades_df.columns):
+        if col_name not in known_columns and col_has_data[col_name]:
             has_date_column = True
             date_column_name = col_name
             date_source = "explicit_column"
             break
-        last_col_idx -= 1
-    
+
     # If no explicit date column found, check if there's an unnamed column at the end
     if not has_date_column and len(trades_df.columns) > 10:
         # Check for unnamed columns that might contain dates
         for col in trades_df.columns:
             if col.startswith('Unnamed:') or col == '':
-                if not trades_df[col].isna().all():
+                if col_has_data[col]:
                     has_date_column = True
                     date_column_name = col
                     date_source = "unnamed_column"
@@ -150,25 +266,53 @@ def generate_pinescript(trades_df, symbol, output_file=None):
     # If still no date column found, try to parse from Cloid field
     if not has_date_column and 'Cloid' in trades_df.columns:
         print("No explicit date column found, attempting to parse dates from Cloid field...")
-        trades_df['Date'] = trades_df['Cloid'].apply(lambda x: parse_date_from_cloid(x))
+        # Cloids repeat their date part across a day's trades — parse each
+        # distinct value once and map the results back instead of calling
+        # parse_date_from_cloid per row
+        cloid_lut = _cloid_date_lut(trades_df['Cloid'].dropna().unique())
         # Check if we successfully parsed any dates
-        valid_dates = trades_df['Date'].apply(lambda x: x[0] is not None if isinstance(x, tuple) else False)
+        valid_dates = trades_df['Cloid'].isin({v for v, ymd in cloid_lut.items() if ymd[0] is not None})
         if valid_dates.any():
             has_date_column = True
             date_column_name = "Cloid"
             date_source = "cloid_parsed"
             print(f"Successfully parsed {valid_dates.sum()} dates from Cloid field")
+            # Store year/month/day as three int16 columns — a tuple column
+            # forces object dtype and per-element Python dispatch in every
+            # later groupby and mask
+            trades_df = trades_df[valid_dates]
+            trades_df[['_y', '_mo', '_d']] = pd.DataFrame(
+                trades_df['Cloid'].map(cloid_lut).tolist(), index=trades_df.index, dtype='int16')
         else:
             print("Could not parse dates from Cloid field")
-    
+
     # Add date parsing if date column exists
     if has_date_column and date_column_name and date_source != "cloid_parsed":
         print(f"Found date column: {date_column_name}")
-        trades_df['Date'] = trades_df[date_column_name].apply(lambda x: parse_date(x))
-        trades_df = trades_df[trades_df['Date'].apply(lambda x: x[0] is not None)]  # Filter out unparseable dates
-    elif has_date_column and date_source == "cloid_parsed":
-        # Already parsed from Cloid, just filter out unparseable dates
-        trades_df = trades_df[trades_df['Date'].apply(lambda x: x[0] is not None)]
+        # Same memoization as the Cloid path, but parse the distinct date
+        # strings with one vectorized to_datetime sweep per format instead
+        # of a per-value strptime loop that pays an exception per miss
+        date_col = trades_df[date_column_name]
+        uniq_dates = pd.Series(date_col.dropna().unique())
+        parsed_dates = pd.Series(pd.NaT, index=uniq_dates.index)
+        for fmt in _DATE_FORMATS:
+            missing = parsed_dates.isna()
+            if not missing.any():
+                break
+            parsed_dates[missing] = pd.to_datetime(
+                uniq_dates[missing].astype(str).str.strip(), format=fmt, errors='coerce')
+        date_lut = {}
+        for v, ts in zip(uniq_dates, parsed_dates):
+            if pd.isna(ts):
+                print(f"Warning: Could not parse date '{v}', skipping...")
+                date_lut[v] = (None, None, None)
+            else:
+                date_lut[v] = (ts.year, ts.month, ts.day)
+        # Filter out unparseable dates, then split the parsed tuples into
+        # the same int16 _y/_mo/_d columns the Cloid path produces
+        trades_df = trades_df[date_col.isin({v for v, ymd in date_lut.items() if ymd[0] is not None})]
+        trades_df[['_y', '_mo', '_d']] = pd.DataFrame(
+            trades_df[date_column_name].map(date_lut).tolist(), index=trades_df.index, dtype='int16')
     
     # Filter trades for the specified symbol
     symbol_trades = consolidate_trades(trades_df, symbol)
@@ -176,11 +320,61 @@ def generate_pinescript(trades_df, symbol, output_file=None):
     if symbol_trades.empty:
         print(f"No trades found for symbol {symbol}")
         return None
-    
-    # Separate trades by type
-    buy_trades = symbol_trades[symbol_trades['Side'] == 'B'].reset_index(drop=True)
-    sell_trades = symbol_trades[symbol_trades['Side'] == 'S'].reset_index(drop=True)
-    short_trades = symbol_trades[symbol_trades['Side'] == 'SS'].reset_index(drop=True)
+
+    # Parse all trade times in one vectorized pass instead of calling
+    # parse_time() per row inside the emission loops (datetime.strptime
+    # re-reads locale state on every call, which dominates on large CSVs).
+    # Distinct times are fewer than consolidated rows — the same timestamp
+    # recurs across sides and prices — so extract once per unique value
+    # and map the (h, m, s) tuples back onto the frame
+    time_strs = symbol_trades['Time'].astype(str)
+    unique_times = pd.Series(time_strs.unique())
+    unique_parts = unique_times.str.extract(r'^(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?$')
+    unique_hms = unique_parts.fillna('0').astype('int16')
+    # The pattern only constrains digit count — also reject out-of-range
+    # fields (e.g. 12:60:61), which strptime used to catch
+    valid_times = (unique_parts[0].notna() & (unique_hms[0] < 24)
+                   & (unique_hms[1] < 60) & (unique_hms[2] < 60))
+    hms_rows = [tuple(row) for row in unique_hms.to_numpy().tolist()]
+    hms_by_time = dict(zip(unique_times, (hms if ok else None for hms, ok in zip(hms_rows, valid_times))))
+    parsed_times = time_strs.map(hms_by_time)
+    bad_times = parsed_times.isna()
+    if bad_times.any():
+        print(f"Warning: skipping {int(bad_times.sum())} trades with unparseable times")
+        symbol_trades = symbol_trades[~bad_times]
+        parsed_times = parsed_times[~bad_times]
+    symbol_trades[['_h', '_m', '_s']] = pd.DataFrame(parsed_times.tolist(), index=symbol_trades.index, dtype='int16')
+
+    # Optional pre-merge: one entry per (date, time bucket, side) cluster
+    # instead of every fill — both the generated script and TradingView's
+    # per-bar work shrink proportionally
+    if merge_window and merge_window > 0:
+        seconds = symbol_trades['_h'].astype('int32') * 3600 + symbol_trades['_m'] * 60 + symbol_trades['_s']
+        symbol_trades['_bucket'] = seconds - seconds % merge_window
+        bucket_cols = (['_y', '_mo', '_d'] if '_y' in symbol_trades.columns else []) + ['_bucket', 'Side']
+        symbol_trades = symbol_trades.groupby(bucket_cols, as_index=False, sort=False, observed=True).agg(
+            Price=('Price', 'mean'), Qty=('Qty', 'sum'))
+        symbol_trades['Price'] = symbol_trades['Price'].round(4)
+        bucket = symbol_trades.pop('_bucket')
+        symbol_trades['_h'], remainder = divmod(bucket, 3600)
+        symbol_trades['_m'], symbol_trades['_s'] = divmod(remainder, 60)
+        # Bucket-start timestamp stands in for the merged fills' times
+        symbol_trades['Time'] = ["%02d:%02d:%02d" % hms for hms in zip(
+            symbol_trades['_h'].tolist(), symbol_trades['_m'].tolist(), symbol_trades['_s'].tolist())]
+
+    # Emit in chronological order: a stable sort makes trades sharing a
+    # timestamp adjacent, so each match condition below is generated once
+    # and reused, and the script reads in time order
+    sort_cols = (['_y', '_mo', '_d'] if '_y' in symbol_trades.columns else []) + ['_h', '_m', '_s', 'Side']
+    symbol_trades = symbol_trades.sort_values(sort_cols, kind='stable', ignore_index=True)
+
+    # Separate trades by type — one pass over the Side column instead of
+    # three full-column equality scans
+    side_groups = {side: group.reset_index(drop=True) for side, group in symbol_trades.groupby('Side', sort=False)}
+    empty_trades = symbol_trades.iloc[0:0]
+    buy_trades = side_groups.get('B', empty_trades)
+    sell_trades = side_groups.get('S', empty_trades)
+    short_trades = side_groups.get('SS', empty_trades)
     
     # Start building the Pine Script
     script_lines = []
@@ -288,83 +482,109 @@ def generate_pinescript(trades_df, symbol, output_file=None):
     
     script_lines.extend([
         "// Check if we're on the correct symbol",
-        f'is_{symbol.lower()}_symbol = syminfo.ticker == "{symbol}"',
+        f'is_{sym_l}_symbol = syminfo.ticker == "{symbol}"',
         "",
         f"// {symbol} Trade Data with {'date and ' if has_date_column else ''}timeframe-aware time matching"
     ])
-    
-    # Generate buy trades with offset
-    if not buy_trades.empty:
-        script_lines.append("// Buy trades (with upward offset to prevent overlap)")
-        for i, trade in buy_trades.iterrows():
-            hour, minute, second = parse_time(trade['Time'])
-            if hour is not None:
-                if has_date_column and 'Date' in trade:
-                    year, month, day = trade['Date'] if isinstance(trade['Date'], tuple) else (None, None, None)
-                    if year is not None:
-                        script_lines.append(f"buy_trade_{i+1} = is_trade_datetime({year}, {month}, {day}, {hour}, {minute}, {second}) ? {trade['Price']} + offset_amount : na    // {year}-{month:02d}-{day:02d},{trade['Time']},{symbol},B,{trade['Price']},{trade['Qty']}")
-                    else:
-                        script_lines.append(f"buy_trade_{i+1} = is_trade_time({hour}, {minute}, {second}) ? {trade['Price']} + offset_amount : na    // {trade['Time']},{symbol},B,{trade['Price']},{trade['Qty']}")
-                else:
-                    script_lines.append(f"buy_trade_{i+1} = is_trade_time({hour}, {minute}, {second}) ? {trade['Price']} + offset_amount : na    // {trade['Time']},{symbol},B,{trade['Price']},{trade['Qty']}")
-    
-    script_lines.append("")
-    
-    # Generate sell trades (no offset - baseline)
-    if not sell_trades.empty:
-        script_lines.append("// Sell trades (baseline - no offset)")
-        for i, trade in sell_trades.iterrows():
-            hour, minute, second = parse_time(trade['Time'])
-            if hour is not None:
-                if has_date_column and 'Date' in trade:
-                    year, month, day = trade['Date'] if isinstance(trade['Date'], tuple) else (None, None, None)
-                    if year is not None:
-                        script_lines.append(f"sell_trade_{i+1} = is_trade_datetime({year}, {month}, {day}, {hour}, {minute}, {second}) ? {trade['Price']} : na     // {year}-{month:02d}-{day:02d},{trade['Time']},{symbol},S,{trade['Price']},{trade['Qty']}")
-                    else:
-                        script_lines.append(f"sell_trade_{i+1} = is_trade_time({hour}, {minute}, {second}) ? {trade['Price']} : na     // {trade['Time']},{symbol},S,{trade['Price']},{trade['Qty']}")
-                else:
-                    script_lines.append(f"sell_trade_{i+1} = is_trade_time({hour}, {minute}, {second}) ? {trade['Price']} : na     // {trade['Time']},{symbol},S,{trade['Price']},{trade['Qty']}")
-    
-    script_lines.append("")
-    
-    # Generate short trades with downward offset
-    if not short_trades.empty:
-        script_lines.append("// Short Sell trades (with downward offset to prevent overlap)")
-        for i, trade in short_trades.iterrows():
-            hour, minute, second = parse_time(trade['Time'])
-            if hour is not None:
-                if has_date_column and 'Date' in trade:
-                    year, month, day = trade['Date'] if isinstance(trade['Date'], tuple) else (None, None, None)
-                    if year is not None:
-                        script_lines.append(f"short_trade_{i+1} = is_trade_datetime({year}, {month}, {day}, {hour}, {minute}, {second}) ? {trade['Price']} - offset_amount : na    // {year}-{month:02d}-{day:02d},{trade['Time']},{symbol},SS,{trade['Price']},{trade['Qty']}")
-                    else:
-                        script_lines.append(f"short_trade_{i+1} = is_trade_time({hour}, {minute}, {second}) ? {trade['Price']} - offset_amount : na    // {trade['Time']},{symbol},SS,{trade['Price']},{trade['Qty']}")
-                else:
-                    script_lines.append(f"short_trade_{i+1} = is_trade_time({hour}, {minute}, {second}) ? {trade['Price']} - offset_amount : na    // {trade['Time']},{symbol},SS,{trade['Price']},{trade['Qty']}")
-    
+
+    # A day's trades share a handful of dates — format each one once and
+    # look the string up per row (shared across all three sides)
+    date_strs = {}
+
+    def emit_side(trades, kind, side, shape, title, var_offset, lbl_offset, lbl_prefix, lbl_style):
+        """Fill the trigger/plotshape/label buffers for one side in a single
+        pass over its rows. The match condition is folded straight into the
+        plotshape call — no per-trade `buy_trade_N` variable — which halves
+        the emitted line count, and TradingView compiles/evaluates half the
+        statements per bar. The templates are built once per side and the
+        formatted condition is reused across all three buffers."""
+        show = "show_" + kind + "_trades"
+        color = kind + "_color"
+        cond_dated = "is_trade_datetime(%d, %d, %d, %d, %d, %d)"
+        cond_timed = "is_trade_time(%d, %d, %d)"
+        trigger_prefix = kind + "_any := " + kind + "_any or "
+        plot_dated = "plotshape(" + show + " and %s ? %s" + var_offset + " : na, style=shape." + shape + ", location=location.absolute, color=" + color + ', size=size.small, title="' + title + ' %s")  // %s,%s,' + symbol + "," + side + ",%s,%s"
+        plot_timed = "plotshape(" + show + " and %s ? %s" + var_offset + " : na, style=shape." + shape + ", location=location.absolute, color=" + color + ', size=size.small, title="' + title + ' %s")  // %s,' + symbol + "," + side + ",%s,%s"
+        lbl_dated = ("    if " + show + " and %s\n"
+                     "        label.new(bar_index, %s" + lbl_offset + ', "' + lbl_prefix + ' @ %s\\nQty: %s\\n%s %s", style=label.style_label_' + lbl_style + ", color=" + color + ", textcolor=color.white, size=size.small)")
+        lbl_timed = ("    if " + show + " and %s\n"
+                     "        label.new(bar_index, %s" + lbl_offset + ', "' + lbl_prefix + ' @ %s\\nQty: %s\\n%s", style=label.style_label_' + lbl_style + ", color=" + color + ", textcolor=color.white, size=size.small)")
+
+        # Rows are uniformly dated or undated after the validity filters, so
+        # pick the template variant once and run a branch-free loop body.
+        # They also arrive time-sorted, which makes repeated timestamps
+        # adjacent: emit one <kind>_tN condition per distinct timestamp and
+        # let every plotshape, label and alert trigger for it reuse the name
+        cond_buf, trigger_buf, plot_buf, label_buf = [], [], [], []
+        cond_name = None
+        last_key = None
+        if has_date_column and '_y' in trades.columns:
+            for time_s, price, qty, hour, minute, second, year, month, day in iter_trade_rows(trades, True):
+                key = (year, month, day, hour, minute, second)
+                if key != last_key:
+                    last_key = key
+                    cond_name = "%s_t%d" % (kind, len(cond_buf) + 1)
+                    cond_buf.append(cond_name + " = " + (cond_dated % key))
+                    trigger_buf.append(trigger_prefix + cond_name)
+                ymd = (year, month, day)
+                date_s = date_strs.get(ymd)
+                if date_s is None:
+                    date_s = date_strs[ymd] = "%d-%02d-%02d" % ymd
+                plot_buf.append(plot_dated % (cond_name, price, price, date_s, time_s, price, qty))
+                label_buf.append(lbl_dated % (cond_name, price, price, qty, date_s, time_s))
+        else:
+            for time_s, price, qty, hour, minute, second, _, _, _ in iter_trade_rows(trades, False):
+                key = (hour, minute, second)
+                if key != last_key:
+                    last_key = key
+                    cond_name = "%s_t%d" % (kind, len(cond_buf) + 1)
+                    cond_buf.append(cond_name + " = " + (cond_timed % key))
+                    trigger_buf.append(trigger_prefix + cond_name)
+                plot_buf.append(plot_timed % (cond_name, price, price, time_s, price, qty))
+                label_buf.append(lbl_timed % (cond_name, price, price, qty, time_s))
+        return cond_buf, trigger_buf, plot_buf, label_buf
+
+    # One pass per side fills all four output buffers at once, instead of
+    # re-walking each side's rows for the plotshape and label sections
+    # separately
+    buy_conds, buy_trigger_lines, buy_plots, buy_labels = emit_side(
+        buy_trades, 'buy', 'B', 'triangleup', 'Buy', ' + offset_amount', ' + offset_amount * 1.5', 'B', 'down')
+    sell_conds, sell_trigger_lines, sell_plots, sell_labels = emit_side(
+        sell_trades, 'sell', 'S', 'triangledown', 'Sell', '', '', 'S', 'left')
+    short_conds, short_trigger_lines, short_plots, short_labels = emit_side(
+        short_trades, 'short', 'SS', 'diamond', 'Short', ' - offset_amount', ' - offset_amount * 1.5', 'SS', 'up')
+
+    # Per-timestamp match conditions, shared by the plots, labels and alerts
+    if buy_conds:
+        script_lines.append("// Buy trade time conditions")
+        script_lines.append("\n".join(buy_conds))
+    if sell_conds:
+        script_lines.append("// Sell trade time conditions")
+        script_lines.append("\n".join(sell_conds))
+    if short_conds:
+        script_lines.append("// Short Sell trade time conditions")
+        script_lines.append("\n".join(short_conds))
+
     script_lines.append("")
-    
+
     # Generate plotshape calls for buy trades
     if not buy_trades.empty:
         script_lines.append("// Plot Buy trades (green triangles above price)")
-        for i, trade in buy_trades.iterrows():
-            script_lines.append(f'plotshape(show_buy_trades ? buy_trade_{i+1} : na, style=shape.triangleup, location=location.absolute, color=buy_color, size=size.small, title="Buy {trade["Price"]}")')
-    
+        script_lines.append("\n".join(buy_plots))
+
     script_lines.append("")
-    
+
     # Generate plotshape calls for sell trades
     if not sell_trades.empty:
         script_lines.append("// Plot Sell trades (red triangles at exact price)")
-        for i, trade in sell_trades.iterrows():
-            script_lines.append(f'plotshape(show_sell_trades ? sell_trade_{i+1} : na, style=shape.triangledown, location=location.absolute, color=sell_color, size=size.small, title="Sell {trade["Price"]}")')
-    
+        script_lines.append("\n".join(sell_plots))
+
     script_lines.append("")
-    
+
     # Generate plotshape calls for short trades
     if not short_trades.empty:
         script_lines.append("// Plot Short Sell trades (orange diamonds below price)")
-        for i, trade in short_trades.iterrows():
-            script_lines.append(f'plotshape(show_short_trades ? short_trade_{i+1} : na, style=shape.diamond, location=location.absolute, color=short_color, size=size.small, title="Short {trade["Price"]}")')
+        script_lines.append("\n".join(short_plots))
     
     script_lines.append("")
     
@@ -377,58 +597,19 @@ def generate_pinescript(trades_df, symbol, output_file=None):
     # Buy trade labels (positioned at actual price, not offset)
     if not buy_trades.empty:
         script_lines.append("    // Buy trade labels")
-        for i, trade in buy_trades.iterrows():
-            hour, minute, second = parse_time(trade['Time'])
-            if hour is not None:
-                if has_date_column and 'Date' in trade:
-                    year, month, day = trade['Date'] if isinstance(trade['Date'], tuple) else (None, None, None)
-                    if year is not None:
-                        script_lines.append(f'    if show_buy_trades and is_trade_datetime({year}, {month}, {day}, {hour}, {minute}, {second})')
-                        script_lines.append(f'        label.new(bar_index, {trade["Price"]} + offset_amount * 1.5, "B @ {trade["Price"]}\\nQty: {trade["Qty"]}\\n{year}-{month:02d}-{day:02d} {trade["Time"]}", style=label.style_label_down, color=buy_color, textcolor=color.white, size=size.small)')
-                    else:
-                        script_lines.append(f'    if show_buy_trades and is_trade_time({hour}, {minute}, {second})')
-                        script_lines.append(f'        label.new(bar_index, {trade["Price"]} + offset_amount * 1.5, "B @ {trade["Price"]}\\nQty: {trade["Qty"]}\\n{trade["Time"]}", style=label.style_label_down, color=buy_color, textcolor=color.white, size=size.small)')
-                else:
-                    script_lines.append(f'    if show_buy_trades and is_trade_time({hour}, {minute}, {second})')
-                    script_lines.append(f'        label.new(bar_index, {trade["Price"]} + offset_amount * 1.5, "B @ {trade["Price"]}\\nQty: {trade["Qty"]}\\n{trade["Time"]}", style=label.style_label_down, color=buy_color, textcolor=color.white, size=size.small)')
-    
+        script_lines.append("\n".join(buy_labels))
+
     # Sell trade labels
     if not sell_trades.empty:
         script_lines.append("    ")
         script_lines.append("    // Sell trade labels")
-        for i, trade in sell_trades.iterrows():
-            hour, minute, second = parse_time(trade['Time'])
-            if hour is not None:
-                if has_date_column and 'Date' in trade:
-                    year, month, day = trade['Date'] if isinstance(trade['Date'], tuple) else (None, None, None)
-                    if year is not None:
-                        script_lines.append(f'    if show_sell_trades and is_trade_datetime({year}, {month}, {day}, {hour}, {minute}, {second})')
-                        script_lines.append(f'        label.new(bar_index, {trade["Price"]}, "S @ {trade["Price"]}\\nQty: {trade["Qty"]}\\n{year}-{month:02d}-{day:02d} {trade["Time"]}", style=label.style_label_left, color=sell_color, textcolor=color.white, size=size.small)')
-                    else:
-                        script_lines.append(f'    if show_sell_trades and is_trade_time({hour}, {minute}, {second})')
-                        script_lines.append(f'        label.new(bar_index, {trade["Price"]}, "S @ {trade["Price"]}\\nQty: {trade["Qty"]}\\n{trade["Time"]}", style=label.style_label_left, color=sell_color, textcolor=color.white, size=size.small)')
-                else:
-                    script_lines.append(f'    if show_sell_trades and is_trade_time({hour}, {minute}, {second})')
-                    script_lines.append(f'        label.new(bar_index, {trade["Price"]}, "S @ {trade["Price"]}\\nQty: {trade["Qty"]}\\n{trade["Time"]}", style=label.style_label_left, color=sell_color, textcolor=color.white, size=size.small)')
-    
+        script_lines.append("\n".join(sell_labels))
+
     # Short trade labels
     if not short_trades.empty:
         script_lines.append("    ")
         script_lines.append("    // Short trade labels")
-        for i, trade in short_trades.iterrows():
-            hour, minute, second = parse_time(trade['Time'])
-            if hour is not None:
-                if has_date_column and 'Date' in trade:
-                    year, month, day = trade['Date'] if isinstance(trade['Date'], tuple) else (None, None, None)
-                    if year is not None:
-                        script_lines.append(f'    if show_short_trades and is_trade_datetime({year}, {month}, {day}, {hour}, {minute}, {second})')
-                        script_lines.append(f'        label.new(bar_index, {trade["Price"]} - offset_amount * 1.5, "SS @ {trade["Price"]}\\nQty: {trade["Qty"]}\\n{year}-{month:02d}-{day:02d} {trade["Time"]}", style=label.style_label_up, color=short_color, textcolor=color.white, size=size.small)')
-                    else:
-                        script_lines.append(f'    if show_short_trades and is_trade_time({hour}, {minute}, {second})')
-                        script_lines.append(f'        label.new(bar_index, {trade["Price"]} - offset_amount * 1.5, "SS @ {trade["Price"]}\\nQty: {trade["Qty"]}\\n{trade["Time"]}", style=label.style_label_up, color=short_color, textcolor=color.white, size=size.small)')
-                else:
-                    script_lines.append(f'    if show_short_trades and is_trade_time({hour}, {minute}, {second})')
-                    script_lines.append(f'        label.new(bar_index, {trade["Price"]} - offset_amount * 1.5, "SS @ {trade["Price"]}\\nQty: {trade["Qty"]}\\n{trade["Time"]}", style=label.style_label_up, color=short_color, textcolor=color.white, size=size.small)')
+        script_lines.append("\n".join(short_labels))
     
     script_lines.append("")
     
@@ -441,7 +622,7 @@ def generate_pinescript(trades_df, symbol, output_file=None):
     script_lines.extend([
         "// Summary table or warning message",
         "if barstate.islast",
-        f"    if is_{symbol.lower()}_symbol",
+        f"    if is_{sym_l}_symbol",
         f"        // Show trade summary for {symbol}",
         "        var table summary_table = table.new(position.top_right, 2, 8, bgcolor=color.white, border_width=1)",
         "        ",
@@ -490,10 +671,12 @@ def generate_pinescript(trades_df, symbol, output_file=None):
     ])
     
     # Add price levels based on trade prices
-    all_prices = symbol_trades['Price'].tolist()
-    if all_prices:
-        min_price = min(all_prices)
-        max_price = max(all_prices)
+    # Vectorized reductions over the float buffer — no Python list of
+    # boxed floats just to run min()/max()
+    all_prices = symbol_trades['Price'].to_numpy()
+    if all_prices.size:
+        min_price = all_prices.min()
+        max_price = all_prices.max()
         mid_price = (min_price + max_price) / 2
         
         script_lines.extend([
@@ -504,18 +687,21 @@ def generate_pinescript(trades_df, symbol, output_file=None):
             ""
         ])
     
-    # Add alert conditions
-    buy_alerts = " or ".join([f"buy_trade_{i+1}" for i in range(len(buy_trades))])
-    sell_alerts = " or ".join([f"sell_trade_{i+1}" for i in range(len(sell_trades))])
-    short_alerts = " or ".join([f"short_trade_{i+1}" for i in range(len(short_trades))])
-    
+    # Add alert conditions — a single running boolean per side instead of
+    # one giant "buy_trade_1 or buy_trade_2 or ..." expression
     script_lines.append("// Add alert conditions for trades")
-    if buy_alerts:
-        script_lines.append(f'alertcondition({buy_alerts}, title="{symbol} Buy Trade", message="{symbol} Buy trade detected")')
-    if sell_alerts:
-        script_lines.append(f'alertcondition({sell_alerts}, title="{symbol} Sell Trade", message="{symbol} Sell trade detected")')
-    if short_alerts:
-        script_lines.append(f'alertcondition({short_alerts}, title="{symbol} Short Trade", message="{symbol} Short trade detected")')
+    if buy_trigger_lines:
+        script_lines.append("bool buy_any = false")
+        script_lines.append("\n".join(buy_trigger_lines))
+        script_lines.append(f'alertcondition(buy_any, title="{symbol} Buy Trade", message="{symbol} Buy trade detected")')
+    if sell_trigger_lines:
+        script_lines.append("bool sell_any = false")
+        script_lines.append("\n".join(sell_trigger_lines))
+        script_lines.append(f'alertcondition(sell_any, title="{symbol} Sell Trade", message="{symbol} Sell trade detected")')
+    if short_trigger_lines:
+        script_lines.append("bool short_any = false")
+        script_lines.append("\n".join(short_trigger_lines))
+        script_lines.append(f'alertcondition(short_any, title="{symbol} Short Trade", message="{symbol} Short trade detected")')
     
     script_lines.append("")
     
@@ -542,55 +728,185 @@ def generate_pinescript(trades_df, symbol, output_file=None):
             "// - WARNING: Trades from different days with same time will match"
         ])
     
-    # Join all lines
-    script_content = "\n".join(script_lines)
-    
-    # Write to file
+    # Write to file — stream the sections to disk instead of joining them
+    # into one giant in-memory copy of the whole script first
     if output_file is None:
-        output_file = f"{symbol.lower()}_trades_indicator.pine"
-    
-    with open(output_file, 'w') as f:
-        f.write(script_content)
-    
-    print(f"Pine Script indicator generated: {output_file}")
-    print(f"Trade Summary for {symbol}:")
-    print(f"  Buy trades: {buy_count}")
-    print(f"  Sell trades: {sell_count}")
-    print(f"  Short trades: {short_count}")
-    print(f"  Total trades: {total_count}")
-    print(f"\nTimeframe Features:")
-    print(f"  - Automatically adapts to chart timeframe")
-    print(f"  - 10s charts: Matches trades within 10-second windows")
-    print(f"  - 1min+ charts: Matches trades to timeframe boundaries")
-    print(f"  - Shows current timeframe in summary table")
-    print(f"  - Anti-overlap: Buy trades offset +0.2%, Short trades offset -0.2%")
-    
+        output_file = f"{sym_l}_trades_indicator.pine"
+
+    # Binary mode skips the TextIOWrapper layer and pins the encoding
+    # (the warning table contains non-ASCII glyphs)
+    with open(output_file, 'wb', buffering=1 << 20) as f:
+        f.writelines((line + "\n").encode('utf-8') for line in script_lines)
+    
+    # One print for the whole summary — no per-line stdout lock/flush
+    summary = [
+        f"Pine Script indicator generated: {output_file}",
+        f"Trade Summary for {symbol}:",
+        f"  Buy trades: {buy_count}",
+        f"  Sell trades: {sell_count}",
+        f"  Short trades: {short_count}",
+        f"  Total trades: {total_count}",
+        "\nTimeframe Features:",
+        "  - Automatically adapts to chart timeframe",
+        "  - 10s charts: Matches trades within 10-second windows",
+        "  - 1min+ charts: Matches trades to timeframe boundaries",
+        "  - Shows current timeframe in summary table",
+        "  - Anti-overlap: Buy trades offset +0.2%, Short trades offset -0.2%",
+    ]
+
     if has_date_column:
-        print(f"  - Date-aware matching: Both date and time must match")
+        summary.append("  - Date-aware matching: Both date and time must match")
         if date_source == "cloid_parsed":
-            print(f"  - Date source: Parsed from Cloid field")
+            summary.append("  - Date source: Parsed from Cloid field")
         else:
-            print(f"  - Date column detected: {date_column_name}")
+            summary.append(f"  - Date column detected: {date_column_name}")
     else:
-        print(f"  - Time-only matching (no date column found)")
-        print(f"  - WARNING: Trades from different days with same time will match")
-    
-    return script_content
+        summary.append("  - Time-only matching (no date column found)")
+        summary.append("  - WARNING: Trades from different days with same time will match")
+    print("\n".join(summary))
+
+    return output_file
+
+def _preview_csv(csv_file):
+    """Stdlib fast path for --preview on small files: one csv pass gathers
+    the symbol counts, row count and non-empty columns without paying for
+    the pandas machinery. Output mirrors the pandas-based preview,
+    including read_csv's 'Unnamed: N' placeholders for blank header
+    fields."""
+    import csv
+    from collections import Counter
+
+    with open(csv_file, newline='') as f:
+        reader = csv.reader(f)
+        raw_header = next(reader, [])
+        columns = [name if name else f"Unnamed: {i}" for i, name in enumerate(raw_header)]
+
+        required_columns = ["Time", "Symbol", "Side", "Price", "Qty"]
+        missing_columns = [col for col in required_columns if col not in columns]
+        if missing_columns:
+            print(f"Error: Missing required columns: {missing_columns}")
+            print(f"Available columns: {columns}")
+            return 1
+
+        symbol_idx = columns.index("Symbol")
+        counts = Counter()
+        total_rows = 0
+        has_data = [False] * len(columns)
+        for row in reader:
+            if not row:
+                continue
+            total_rows += 1
+            if len(row) > symbol_idx and row[symbol_idx]:
+                counts[row[symbol_idx]] += 1
+            for i, value in enumerate(row):
+                if value and not has_data[i]:
+                    has_data[i] = True
+
+    print("Available symbols in CSV:")
+    for symbol in sorted(counts):
+        print(f"  {symbol}: {counts[symbol]} trades")
+
+    print(f"\nCSV Structure:")
+    print(f"  Columns: {columns}")
+    print(f"  Total rows: {total_rows}")
+
+    potential_date_cols = [col for col, filled in zip(columns, has_data)
+                           if col not in required_columns and filled]
+    if potential_date_cols:
+        print(f"  Potential date columns: {potential_date_cols}")
+
+    return 0
+
+def _read_symbol_csv_arrow(csv_file, symbol, drop_columns):
+    """Stream the CSV through pyarrow's multithreaded reader, keeping only
+    one symbol's rows per batch, and hand back a pandas frame.
+
+    Time, Symbol and Side are pinned to plain strings — Arrow would
+    otherwise infer Time as time64 and reformat values like 09:33, breaking
+    the verbatim CSV text the emitted comments must carry. Raises
+    ImportError when pyarrow is unavailable so the caller can fall back to
+    the chunked pandas reader."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pa_csv
+
+    convert = pa_csv.ConvertOptions(
+        column_types={'Time': pa.string(), 'Symbol': pa.string(), 'Side': pa.string()})
+    pieces = []
+    with pa_csv.open_csv(csv_file, convert_options=convert) as reader:
+        schema = reader.schema
+        for batch in reader:
+            table = pa.Table.from_batches([batch])
+            pieces.append(table.filter(pc.equal(table.column('Symbol'), symbol)))
+
+    table = pa.concat_tables(pieces) if pieces else schema.empty_table()
+    table = table.select([c for c in table.column_names if c not in drop_columns])
+    df = table.to_pandas()
+    df['Symbol'] = df['Symbol'].astype('category')
+    df['Side'] = df['Side'].astype('category')
+    return df
 
 def main():
     parser = argparse.ArgumentParser(description="Generate Pine Script trade indicator from CSV")
     parser.add_argument("csv_file", help="Path to CSV file containing trade data")
     parser.add_argument("symbol", nargs="?", help="Symbol to generate indicator for (e.g., SEPN)")
     parser.add_argument("-o", "--output", help="Output Pine Script file name")
+    parser.add_argument("--merge-window", type=int, default=0, metavar="SECONDS",
+                        help="Merge same-side trades within SECONDS-wide time buckets (sums Qty, averages Price)")
+    parser.add_argument("--all-symbols", action="store_true",
+                        help="Generate an indicator script for every symbol in the CSV")
     parser.add_argument("--preview", action="store_true", help="Preview available symbols in CSV")
     
     args = parser.parse_args()
-    
+
+    # Fail fast on a missing file — one stat instead of paying the pandas
+    # import and spinning up a CSV reader just to catch its
+    # FileNotFoundError
+    if not os.path.isfile(args.csv_file):
+        print(f"Error: File \"{args.csv_file}\" not found")
+        return 1
+
+    # A positional symbol would pre-filter the read below to that one
+    # symbol, silently dropping the rest from --all-symbols output
+    if args.all_symbols and args.symbol:
+        print("Error: a symbol argument cannot be combined with --all-symbols")
+        return 1
+
+    # For small files the preview answer comes cheaper from one stdlib csv
+    # pass than from spinning up the pandas reader
+    if args.preview and os.path.getsize(args.csv_file) < (4 << 20):
+        return _preview_csv(args.csv_file)
+
     try:
         # Read CSV file - try without pandas first
         try:
             import pandas as pd
-            df = pd.read_csv(args.csv_file)
+            # Peek at the header, then skip columns nothing downstream reads.
+            # The trade columns, Cloid and any unrecognized (potential date)
+            # columns stay; --preview keeps everything so the structure dump
+            # reflects the real file
+            header = pd.read_csv(args.csv_file, nrows=0).columns
+            unused = {'Route', 'Broker', 'Account', 'Type'}
+            wanted = list(header) if args.preview else [c for c in header if c not in unused]
+            # Category dtypes turn the later Symbol/Side comparisons and
+            # groupbys into int8 code compares instead of string compares
+            read_kwargs = dict(usecols=wanted,
+                               dtype={'Symbol': 'category', 'Side': 'category', 'Time': str})
+            if not args.preview and args.symbol and 'Symbol' in header:
+                # Only one symbol's rows survive anyway — stream the file
+                # batch by batch and filter as we go, so peak memory is
+                # bounded by a batch plus the kept rows, not the whole file.
+                # pyarrow's reader parses batches on multiple cores; fall
+                # back to pandas chunks when it is not installed
+                target = args.symbol.upper()
+                try:
+                    df = _read_symbol_csv_arrow(args.csv_file, target, unused)
+                except ImportError:
+                    pieces = [chunk[chunk['Symbol'] == target]
+                              for chunk in pd.read_csv(args.csv_file, chunksize=262144, **read_kwargs)]
+                    df = pd.concat(pieces) if pieces else pd.read_csv(args.csv_file, **read_kwargs)
+            else:
+                df = pd.read_csv(args.csv_file, **read_kwargs)
         except ImportError:
             print("Error: pandas is required. Please install with: pip install pandas")
             return 1
@@ -607,9 +923,8 @@ def main():
         # Preview mode
         if args.preview:
             print("Available symbols in CSV:")
-            symbols = df["Symbol"].unique()
-            for symbol in sorted(symbols):
-                count = len(df[df["Symbol"] == symbol])
+            # One hash-counting pass instead of a full column scan per symbol
+            for symbol, count in df["Symbol"].value_counts().sort_index().items():
                 print(f"  {symbol}: {count} trades")
             
             # Show column information
@@ -617,17 +932,36 @@ def main():
             print(f"  Columns: {list(df.columns)}")
             print(f"  Total rows: {len(df)}")
             
-            # Check for potential date columns
-            potential_date_cols = []
-            for col in df.columns:
-                if col not in required_columns and not df[col].isna().all():
-                    potential_date_cols.append(col)
-            
+            # Check for potential date columns — notna().any() short-circuits
+            # on the first non-null instead of materializing a full mask per
+            # column just to negate isna().all()
+            potential_date_cols = [col for col in df.columns
+                                   if col not in required_columns and df[col].notna().any()]
+
             if potential_date_cols:
                 print(f"  Potential date columns: {potential_date_cols}")
             
             return 0
         
+        # Generate every symbol's script, fanning the independent per-symbol
+        # frames out to worker processes
+        if args.all_symbols:
+            if args.output:
+                print("Error: -o/--output cannot be combined with --all-symbols")
+                return 1
+            groups = {str(sym): group for sym, group in df.groupby('Symbol', observed=True)}
+            symbols = sorted(groups)
+            if not symbols:
+                print("No symbols found in CSV")
+                return 1
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor() as executor:
+                futures = [executor.submit(generate_pinescript, groups[sym], sym, None, args.merge_window)
+                           for sym in symbols]
+                generated = [future.result() for future in futures]
+            print(f"\nGenerated {sum(1 for output in generated if output)} of {len(symbols)} indicator scripts")
+            return 0
+
         # Check if symbol was provided
         if not args.symbol:
             print("Error: Symbol is required when not using --preview")
@@ -635,7 +969,7 @@ def main():
             return 1
         
         # Generate Pine Script
-        script = generate_pinescript(df, args.symbol.upper(), args.output)
+        script = generate_pinescript(df, args.symbol.upper(), args.output, args.merge_window)
         
         if script is None:
             return 1